@@ -1,28 +1,97 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
 import requests
+import httpx
 import json
+import os
 import time
+import orjson
 from datetime import datetime, date, timedelta
-from collections import defaultdict
 import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any
-import tempfile
+import numpy as np
 import pandas as pd
+from cachetools import TTLCache, cachedmethod
+from cachetools.keys import hashkey
 import google.auth.transport.requests
 from google.oauth2 import service_account
 
 app = Flask(__name__)
 CORS(app)
 
+GOOGLE_API_WORKERS = 20
+GOOGLE_API_MAX_RETRIES = 5
+# Admin SDK Reports quota is 2400 queries/min (40/s); stay under it with some headroom
+GOOGLE_API_QPS = 30
+# Limiters live per process, so the quota is split across the gunicorn workers
+# (gunicorn takes its worker count from the same WEB_CONCURRENCY variable)
+SERVER_PROCESSES = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+# Caps in-flight Admin SDK calls across concurrent /upload requests in this process
+google_api_slots = threading.BoundedSemaphore(GOOGLE_API_WORKERS)
+
 # ------------------ Utility ------------------
 
-def parse_duration(duration_str):
+def ojsonify(obj, status=200):
+    # orjson encodes much faster than jsonify and handles numpy scalars from pandas natively
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+class TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> None:
+        # A request larger than the bucket waits for a full bucket and then goes into debt,
+        # so it is still charged in full and later callers wait it off
+        needed = min(tokens, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= tokens
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+
+# Longest a request thread will sleep on one Retry-After before trying again
+MAX_RETRY_AFTER_SECONDS = 30
+
+def retry_after_seconds(response, attempt):
+    # Honour the server's Retry-After when it gives one in seconds, otherwise back off exponentially.
+    # Negative values are ignored and long ones capped, so one header can't stall a worker thread
     try:
-        h, m, s = map(int, str(duration_str).split(":"))
-        return h * 3600 + m * 60 + s
-    except:
-        return 0
+        seconds = float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        seconds = -1
+    if not 0 <= seconds:
+        seconds = 2 ** attempt
+    return min(seconds, MAX_RETRY_AFTER_SECONDS)
+
+def parse_durations(durations):
+    # Vectorized HH:MM:SS -> seconds; anything that doesn't parse counts as 0
+    parts = durations.astype(str).str.extract(r'^\s*(\d+):(\d+):(\d+)\s*$').astype(float)
+    return (parts[0] * 3600 + parts[1] * 60 + parts[2]).fillna(0).astype(int)
+
+def ratio_or_inf(numerator, denominator):
+    # Vectorized numerator/denominator rounded to 2dp, "Inf" where denominator is 0
+    num = numerator.to_numpy(dtype=float)
+    den = denominator.to_numpy(dtype=float)
+    nonzero = den != 0
+    ratio = np.divide(num, den, out=np.full_like(num, np.inf), where=nonzero).round(2).astype(object)
+    ratio[~nonzero] = "Inf"
+    return pd.Series(ratio, index=numerator.index)
 
 # ------------------ XLSX Call Duration Analysis ------------------
 
@@ -31,27 +100,29 @@ def analyze_xlsx():
     try:
         file = request.files['file']
         if not file:
-            return jsonify({"error": "No file uploaded"}), 400
-
-        df = pd.read_excel(file)
+            return ojsonify({"error": "No file uploaded"}, 400)
 
         rename_map = {
             "Inbound total no.of Calls": "Inbound Calls",
             "Outbound total no.of Calls": "Outbound Calls"
         }
-        df.rename(columns=rename_map, inplace=True)
-
         required = [
             "Name", "Total Duration", "Missed Calls", "Voicemails",
             "Inbound Calls", "Outbound Calls", "Inbound Duration", "Outbound Duration"
         ]
+        wanted = set(required) | set(rename_map)
+
+        # Only materialize the columns we use; a missing one is still reported below
+        df = pd.read_excel(file, engine='calamine', usecols=lambda col: col in wanted)
+        df.rename(columns=rename_map, inplace=True)
+
         for col in required:
             if col not in df.columns:
-                return jsonify({"error": f"Missing column: {col}"}), 400
+                return ojsonify({"error": f"Missing column: {col}"}, 400)
 
-        df["Total Duration (secs)"] = df["Total Duration"].apply(parse_duration)
-        df["Inbound Duration (secs)"] = df["Inbound Duration"].apply(parse_duration)
-        df["Outbound Duration (secs)"] = df["Outbound Duration"].apply(parse_duration)
+        df["Total Duration (secs)"] = parse_durations(df["Total Duration"])
+        df["Inbound Duration (secs)"] = parse_durations(df["Inbound Duration"])
+        df["Outbound Duration (secs)"] = parse_durations(df["Outbound Duration"])
 
         df["Missed Calls"] = pd.to_numeric(df["Missed Calls"], errors='coerce').fillna(0)
         df["Voicemails"] = pd.to_numeric(df["Voicemails"], errors='coerce').fillna(0)
@@ -61,18 +132,17 @@ def analyze_xlsx():
         df["Total Hours"] = (df["Total Duration (secs)"] / 3600).round(2)
         df["Total Missed or Voicemails"] = df["Missed Calls"] + df["Voicemails"]
 
-        df["Call Ratio (Inbound/Outbound)"] = df.apply(
-            lambda row: round(row["Inbound Calls"] / row["Outbound Calls"], 2)
-            if row["Outbound Calls"] != 0 else "Inf", axis=1
+        df["Call Ratio (Inbound/Outbound)"] = ratio_or_inf(df["Inbound Calls"], df["Outbound Calls"])
+        df["Duration Ratio (Inbound/Outbound)"] = ratio_or_inf(
+            df["Inbound Duration (secs)"], df["Outbound Duration (secs)"]
         )
 
-        df["Duration Ratio (Inbound/Outbound)"] = df.apply(
-            lambda row: round(row["Inbound Duration (secs)"] / row["Outbound Duration (secs)"], 2)
-            if row["Outbound Duration (secs)"] != 0 else "Inf", axis=1
-        )
+        if df.empty:
+            return ojsonify({"users": []})
 
-        high_hours_threshold = df["Total Hours"].quantile(0.75)
-        high_missed_vm_threshold = df["Total Missed or Voicemails"].quantile(0.75)
+        high_hours_threshold, high_missed_vm_threshold = np.percentile(
+            df[["Total Hours", "Total Missed or Voicemails"]].to_numpy(dtype=float), 75, axis=0
+        )
 
         top_users = df[
             (df["Total Hours"] >= high_hours_threshold) |
@@ -89,39 +159,46 @@ def analyze_xlsx():
             "Call Ratio (Inbound/Outbound)", "Duration Ratio (Inbound/Outbound)"
         ]].to_dict(orient='records')
 
-        return jsonify({"users": users})
+        return ojsonify({"users": users})
 
     except Exception as e:
-        return jsonify({"error": "Internal Server Error", "details": str(e)}), 500
+        return ojsonify({"error": "Internal Server Error", "details": str(e)}, 500)
 
 # ------------------ Google Workspace Inactivity Analysis ------------------
 
+# Shared by every /upload request in this process; each worker process gets an equal share of the QPS
+google_api_limiter = TokenBucket(GOOGLE_API_QPS / SERVER_PROCESSES)
+
+# Most recent complete daily usage report (they lag 2-3 days), walking back about a week
+LOGIN_REPORT_DAYS = range(2, 10)
+# Report warnings meaning some users are missing from that date's report
+INCOMPLETE_REPORT_WARNINGS = {"PARTIAL_DATA_AVAILABLE", "DATA_NOT_AVAILABLE"}
+# Per-user storage lookups for users the report shows no quota for, most recent day first
+STORAGE_FALLBACK_DAYS = range(4, 30)
+
 @app.route('/upload', methods=['POST'])
 def upload_service_account():
     try:
         if 'file' not in request.files:
-            return jsonify({'error': 'No file uploaded'}), 400
+            return ojsonify({'error': 'No file uploaded'}, 400)
 
         file = request.files['file']
         inactivity_days = int(request.form.get('inactivity_days'))
         admin_email = request.form.get('admin_email')
 
         if not admin_email:
-            return jsonify({'error': 'Admin email is required'}), 400
+            return ojsonify({'error': 'Admin email is required'}, 400)
 
-        temp = tempfile.NamedTemporaryFile(delete=False)
-        file_path = temp.name
-        temp.close()
-        file.save(file_path)
+        # Keep the key in memory; it never needs to touch disk
+        key_info = json.loads(file.read())
 
         SCOPES = [
-            'https://www.googleapis.com/auth/admin.directory.user.readonly',
             'https://www.googleapis.com/auth/admin.reports.usage.readonly',
             'https://www.googleapis.com/auth/admin.reports.audit.readonly'
         ]
 
-        credentials = service_account.Credentials.from_service_account_file(
-            file_path,
+        credentials = service_account.Credentials.from_service_account_info(
+            key_info,
             scopes=SCOPES,
             subject=admin_email
         )
@@ -133,102 +210,260 @@ def upload_service_account():
             'Content-Type': 'application/json'
         }
 
-        def safe_get_json(url):
-            try:
-                response = requests.get(url, headers=headers)
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    return {}
-            except Exception:
+        with requests.Session() as session:
+            session.headers.update(headers)
+
+            def safe_get_json(url):
+                for attempt in range(GOOGLE_API_MAX_RETRIES):
+                    google_api_limiter.acquire()
+                    try:
+                        with google_api_slots:
+                            response = session.get(url)
+                    except Exception:
+                        return {}
+                    if response.status_code == 200:
+                        return response.json()
+                    if response.status_code != 429:
+                        return {}
+                    if attempt < GOOGLE_API_MAX_RETRIES - 1:
+                        time.sleep(retry_after_seconds(response, attempt))
                 return {}
 
-        user_emails = []
-        page_token = None
-        while True:
-            url = 'https://admin.googleapis.com/admin/directory/v1/users?customer=my_customer&maxResults=500'
-            if page_token:
-                url += f"&pageToken={page_token}"
-            res = safe_get_json(url)
-            user_emails.extend([u['primaryEmail'] for u in res.get('users', [])])
-            page_token = res.get('nextPageToken')
-            if not page_token:
-                break
-
-        now = datetime.utcnow()
-        inactive_users = []
-
-        for email in user_emails:
-            login_url = f"https://admin.googleapis.com/admin/reports/v1/activity/users/{email}/applications/login?maxResults=1"
-            login_data = safe_get_json(login_url)
-
-            events = login_data.get("items", [])
-            if not events or not events[0].get("id", {}).get("time"):
-                continue
-
-            last_login_str = events[0]["id"]["time"]
-            try:
-                last_login_dt = datetime.strptime(last_login_str, "%Y-%m-%dT%H:%M:%S.%fZ")
-            except ValueError:
-                last_login_dt = datetime.strptime(last_login_str, "%Y-%m-%dT%H:%M:%SZ")
-
-            days_inactive = (now - last_login_dt).days
-            if days_inactive < inactivity_days:
-                continue
-
-            total_storage_mb = 0
-            for days_ago in range(4, 30):
-                usage_date = (now - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-                usage_url = f"https://admin.googleapis.com/admin/reports/v1/usage/users/{email}/dates/{usage_date}"
-                usage_data = safe_get_json(usage_url)
-                reports = usage_data.get("usageReports", [])
-                if not reports:
-                    continue
-                parameters = reports[0].get("parameters", [])
-                for param in parameters:
-                    if param.get("name") == "accounts:used_quota_in_mb":
-                        total_storage_mb = float(param.get("intValue", 0))
+            now = datetime.utcnow()
+
+            # The all-users usage report lists every account with its last login time and
+            # storage used, replacing a directory listing plus per-user login and storage calls.
+            # Only a complete report is used, since users missing from it would silently drop out
+            last_logins = None
+            for days_ago in LOGIN_REPORT_DAYS:
+                report_date = (now - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+                date_logins = {}
+                date_storage_mb = {}
+                page_token = None
+                while True:
+                    url = f"https://admin.googleapis.com/admin/reports/v1/usage/users/all/dates/{report_date}?parameters=accounts:last_login_time,accounts:used_quota_in_mb&maxResults=1000"
+                    if page_token:
+                        url += f"&pageToken={page_token}"
+                    res = safe_get_json(url)
+                    warning_codes = {warning.get("code") for warning in res.get("warnings", [])}
+                    if not res.get("usageReports") or warning_codes & INCOMPLETE_REPORT_WARNINGS:
+                        date_logins = None
+                        break
+                    for report in res["usageReports"]:
+                        email = report.get("entity", {}).get("userEmail")
+                        if not email:
+                            continue
+                        for param in report.get("parameters", []):
+                            if param.get("name") == "accounts:last_login_time" and param.get("datetimeValue"):
+                                date_logins[email] = param["datetimeValue"]
+                            elif param.get("name") == "accounts:used_quota_in_mb":
+                                date_storage_mb[email] = float(param.get("intValue", 0))
+                    page_token = res.get("nextPageToken")
+                    if not page_token:
                         break
-                if total_storage_mb > 0:
+                if date_logins is not None:
+                    last_logins, storage_mb, report_days_ago = date_logins, date_storage_mb, days_ago
                     break
 
-            inactive_users.append({
-                "email": email,
-                "last_login": last_login_dt.strftime("%Y-%m-%d"),
-                "inactive_days": days_inactive,
-                "storage_gb": round(total_storage_mb / 1024, 2)
-            })
+            if last_logins is None:
+                return ojsonify({'error': 'No complete Google Workspace usage report is available yet'}, 502)
 
-            time.sleep(0.5)
+            def parse_login_time(value):
+                try:
+                    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+                except ValueError:
+                    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
 
-        inactive_users.sort(key=lambda x: x["storage_gb"], reverse=True)
+            candidates = []
+            for email, last_login_str in last_logins.items():
+                last_login_dt = parse_login_time(last_login_str)
+                # Accounts that never signed in report the Unix epoch
+                if last_login_dt.year == 1970:
+                    continue
 
-        return jsonify({"results": inactive_users})
+                days_inactive = (now - last_login_dt).days
+                if days_inactive >= inactivity_days:
+                    candidates.append((email, last_login_dt, days_inactive))
+
+            def lookup_storage_mb(email):
+                # The report's own quota when it has one; otherwise walk back a day at a time to
+                # the most recent positive quota. None means a lookup failed or stayed rate limited
+                if storage_mb.get(email):
+                    return storage_mb[email]
+                for days_ago in STORAGE_FALLBACK_DAYS:
+                    if days_ago == report_days_ago:
+                        continue
+                    usage_date = (now - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+                    usage_data = safe_get_json(f"https://admin.googleapis.com/admin/reports/v1/usage/users/{email}/dates/{usage_date}?parameters=accounts:used_quota_in_mb")
+                    # Any answer from the API is a non-empty object; {} is safe_get_json giving up
+                    if not usage_data:
+                        return None
+                    reports = usage_data.get("usageReports", [])
+                    if not reports:
+                        continue
+                    for param in reports[0].get("parameters", []):
+                        if param.get("name") == "accounts:used_quota_in_mb":
+                            total_storage_mb = float(param.get("intValue", 0))
+                            if total_storage_mb > 0:
+                                return total_storage_mb
+                            break
+                return 0
+
+            def probe_user(email, last_login_dt, days_inactive):
+                # The usage report is a few days old, so a user may have signed in since. The
+                # login audit log is current; when it has a newer sign-in, that one counts
+                login_url = f"https://admin.googleapis.com/admin/reports/v1/activity/users/{email}/applications/login?maxResults=1"
+                events = safe_get_json(login_url).get("items", [])
+                if events and events[0].get("id", {}).get("time"):
+                    last_login_dt = max(last_login_dt, parse_login_time(events[0]["id"]["time"]))
+                    days_inactive = (now - last_login_dt).days
+                    if days_inactive < inactivity_days:
+                        return None
+
+                total_storage_mb = lookup_storage_mb(email)
+                return {
+                    "email": email,
+                    "last_login": last_login_dt.strftime("%Y-%m-%d"),
+                    "inactive_days": days_inactive,
+                    "storage_gb": round(total_storage_mb / 1024, 2) if total_storage_mb is not None else None
+                }
+
+            inactive_users = []
+            with ThreadPoolExecutor(max_workers=GOOGLE_API_WORKERS) as executor:
+                futures = [executor.submit(probe_user, *candidate) for candidate in candidates]
+                for future in as_completed(futures):
+                    user = future.result()
+                    if user:
+                        inactive_users.append(user)
+
+        # Largest storage first; users whose storage couldn't be determined go last
+        inactive_users.sort(key=lambda x: (x["storage_gb"] is not None, x["storage_gb"] or 0), reverse=True)
+
+        return ojsonify({"results": inactive_users})
 
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 # ------------------ JIRA Productivity Analyzer ------------------
 
+# Search results are shared across analyzer instances; keyed on the account (with the
+# token hashed) so one account never sees issues fetched with another's permissions
+jira_issues_cache = TTLCache(maxsize=128, ttl=60)
+jira_issues_cache_lock = threading.Lock()
+
+class ClosingTTLCache(TTLCache):
+    # Calls close() on values as they expire or are evicted for space
+    def popitem(self):
+        key, value = super().popitem()
+        value.close()
+        return key, value
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for _, value in expired:
+            value.close()
+        return expired
+
+# Analyzers (and their pooled HTTP connections) are reused across requests for the
+# same account; only a hash of the API token is kept in the key
+jira_analyzer_cache = ClosingTTLCache(maxsize=64, ttl=300)
+jira_analyzer_cache_lock = threading.Lock()
+
+JIRA_PAGE_WORKERS = 8
+JIRA_MAX_RETRIES = 5
+
+def _build_issue_record(issue: Dict[str, Any]) -> Dict[str, Any]:
+    # Date fields are left as raw strings here and parsed in bulk by _parse_dates
+    fields = issue['fields']
+    status = fields['status']
+    assignee = fields.get('assignee')
+    priority = fields.get('priority')
+    status_category_lc = status['statusCategory']['name'].lower()
+    return {
+        'key': issue['key'],
+        'summary': fields.get('summary', ''),
+        'status': status['name'],
+        'status_category': status['statusCategory']['name'],
+        'status_category_lc': status_category_lc,
+        'is_done': status_category_lc == 'done',
+        'assignee': assignee['displayName'] if assignee else 'Unassigned',
+        'assignee_id': assignee['accountId'] if assignee else None,
+        'created': fields.get('created'),
+        'resolution_date': fields.get('resolutiondate'),
+        'due_date': fields.get('duedate'),
+        'priority': priority['name'] if priority else 'None',
+        'issue_type': fields['issuetype']['name'],
+        'time_spent': fields.get('timespent', 0) or 0,
+        'original_estimate': fields.get('timeoriginalestimate', 0) or 0
+    }
+
+def _jira_account_key(base_url: str, username: str, api_token: str) -> tuple:
+    # Cache key for an account; the token is only ever kept as a hash
+    return (base_url.rstrip('/'), username, hashlib.sha256(api_token.encode()).hexdigest())
+
+def _project_filter(project_key: str) -> str:
+    # '', None and 'ALL' in any case all mean every project
+    return None if not project_key or project_key.upper() == 'ALL' else project_key
+
+def _parse_dates(values: List[Any]) -> List[Any]:
+    # JIRA timestamps start with YYYY-MM-DD in the issue's own offset, which is the date we keep
+    parsed = pd.to_datetime(pd.Series(values, dtype=object).str.slice(0, 10), format='%Y-%m-%d', errors='coerce')
+    # Build a new object Series rather than writing into .dt.date, which is a read-only view under pandas 3
+    return parsed.dt.date.astype(object).where(parsed.notna(), None).tolist()
+
 class JiraProductivityAnalyzer:
     def __init__(self, base_url: str, username: str, api_token: str):
         self.base_url = base_url.rstrip('/')
         self.auth = base64.b64encode(f"{username}:{api_token}".encode()).decode()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'Basic {self.auth}',
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        })
-
+        self.account_key = _jira_account_key(base_url, username, api_token)
+        # HTTP/2 lets the concurrent page fetches multiplex over one connection
+        self.session = httpx.Client(
+            http2=True,
+            # requests.Session followed redirects (http->https, renamed sites); keep doing so
+            follow_redirects=True,
+            headers={
+                'Authorization': f'Basic {self.auth}',
+                'Accept': 'application/json',
+                'Content-Type': 'application/json'
+            },
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=httpx.Timeout(30.0)
+        )
+        # An analyzer evicted from the cache while a request is still using it is
+        # only closed once that request releases it
+        self._users = 0
+        self._evicted = False
+        self._lifecycle_lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lifecycle_lock:
+            self._users += 1
+
+    def release(self) -> None:
+        with self._lifecycle_lock:
+            self._users -= 1
+            close_now = self._evicted and not self._users
+        if close_now:
+            self.session.close()
+
+    def close(self) -> None:
+        with self._lifecycle_lock:
+            self._evicted = True
+            close_now = not self._users
+        if close_now:
+            self.session.close()
+
+    @cachedmethod(
+        lambda self: jira_issues_cache,
+        key=lambda self, project_key=None, batch_size=100: hashkey(
+            *self.account_key, _project_filter(project_key), batch_size),
+        lock=lambda self: jira_issues_cache_lock
+    )
     def fetch_all_issues(self, project_key: str = None, batch_size: int = 100) -> Dict[str, Any]:
         url = f"{self.base_url}/rest/api/3/search"
-        all_issues = []
-        start_at = 0
-        total_issues = 0
-        fetched_count = 0
 
-        jql_query = f'project = "{project_key}" ORDER BY created DESC' if project_key and project_key.upper() != 'ALL' else 'ORDER BY created DESC'
+        project = _project_filter(project_key)
+        jql_query = f'project = "{project}" ORDER BY created DESC' if project else 'ORDER BY created DESC'
 
         request_template = {
             "jql": jql_query,
@@ -241,26 +476,27 @@ class JiraProductivityAnalyzer:
         }
 
         try:
-            while True:
-                request_body = {
-                    **request_template,
-                    "startAt": start_at,
-                    "maxResults": batch_size
-                }
-                response = self.session.post(url, json=request_body)
-                response.raise_for_status()
-                data = response.json()
-
-                if start_at == 0:
-                    total_issues = data['total']
-
-                all_issues.extend(data['issues'])
-                fetched_count += len(data['issues'])
-                start_at += batch_size
-
-                if fetched_count >= total_issues or len(data['issues']) == 0:
-                    break
-                time.sleep(0.2)
+            # The first page tells us the total, after which the rest can be fetched concurrently
+            first_page = self._search_page(url, request_template, 0, batch_size)
+            total_issues = first_page['total']
+            page_size = len(first_page['issues'])
+            pages = {0: first_page['issues']}
+
+            if page_size:
+                with ThreadPoolExecutor(max_workers=JIRA_PAGE_WORKERS) as executor:
+                    futures = {
+                        executor.submit(self._search_page, url, request_template, start_at, page_size): start_at
+                        for start_at in range(page_size, total_issues, page_size)
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            pages[futures[future]] = future.result()['issues']
+                        except Exception:
+                            # The search has failed; don't start the pages still queued
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            raise
+
+            all_issues = [issue for start_at in sorted(pages) for issue in pages[start_at]]
 
             return {
                 'issues': all_issues,
@@ -268,36 +504,34 @@ class JiraProductivityAnalyzer:
                 'startAt': 0,
                 'maxResults': len(all_issues)
             }
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Error fetching JIRA issues: {e}")
             raise
 
-    def analyze_productivity(self, jira_data: Dict[str, Any]) -> Dict[str, Any]:
-        issues = []
-        for issue in jira_data['issues']:
-            fields = issue['fields']
-            created_date = datetime.fromisoformat(fields['created'].replace('Z', '+00:00')).date() if fields.get('created') else None
-            resolution_date = datetime.fromisoformat(fields['resolutiondate'].replace('Z', '+00:00')).date() if fields.get('resolutiondate') else None
-
-            issue_data = {
-                'key': issue['key'],
-                'summary': fields.get('summary', ''),
-                'status': fields['status']['name'],
-                'status_category': fields['status']['statusCategory']['name'],
-                'assignee': fields['assignee']['displayName'] if fields.get('assignee') else 'Unassigned',
-                'assignee_id': fields['assignee']['accountId'] if fields.get('assignee') else None,
-                'created': created_date,
-                'resolution_date': resolution_date,
-                'due_date': datetime.fromisoformat(fields['duedate']).date() if fields.get('duedate') else None,
-                'priority': fields['priority']['name'] if fields.get('priority') else 'None',
-                'issue_type': fields['issuetype']['name'],
-                'time_spent': fields.get('timespent', 0) or 0,
-                'original_estimate': fields.get('timeoriginalestimate', 0) or 0
-            }
-            issues.append(issue_data)
+    def _search_page(self, url: str, request_template: Dict[str, Any], start_at: int, batch_size: int) -> Dict[str, Any]:
+        request_body = {
+            **request_template,
+            "startAt": start_at,
+            "maxResults": batch_size
+        }
+        for attempt in range(JIRA_MAX_RETRIES):
+            response = self.session.post(url, json=request_body)
+            if response.status_code != 429 or attempt == JIRA_MAX_RETRIES - 1:
+                break
+            time.sleep(retry_after_seconds(response, attempt))
+        response.raise_for_status()
+        return response.json()
 
-        user_stats = self.calculate_user_stats(issues)
-        overall_stats = self.calculate_overall_stats(issues)
+    def analyze_productivity(self, jira_data: Dict[str, Any]) -> Dict[str, Any]:
+        issues = [_build_issue_record(issue) for issue in jira_data['issues']]
+        if issues:
+            for column in ('created', 'resolution_date', 'due_date'):
+                for issue, value in zip(issues, _parse_dates([issue[column] for issue in issues])):
+                    issue[column] = value
+        # One "today" for both passes so they agree even across midnight
+        today = date.today()
+        user_stats = self.calculate_user_stats(issues, today)
+        overall_stats = self.calculate_overall_stats(issues, today)
         return {
             'issues': issues,
             'user_stats': user_stats,
@@ -305,47 +539,54 @@ class JiraProductivityAnalyzer:
             'total_issues': jira_data['total']
         }
 
-    def calculate_user_stats(self, issues: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-        stats = defaultdict(lambda: {
-            'assignee': '', 'total': 0, 'completed': 0, 'in_progress': 0, 'todo': 0,
-            'completion_rate': 0, 'total_time_spent': 0, 'avg_time_per_task': 0,
-            'completed_this_month': 0, 'overdue_tasks': 0
-        })
-        current_month = date.today().month
-        current_year = date.today().year
-        today = date.today()
-        for issue in issues:
-            assignee = issue['assignee']
-            if assignee == 'Unassigned':
-                continue
-            stats[assignee]['assignee'] = assignee
-            stats[assignee]['total'] += 1
-            stats[assignee]['total_time_spent'] += issue['time_spent']
-            status_category = issue['status_category'].lower()
-            if status_category == 'done':
-                stats[assignee]['completed'] += 1
-                if issue['resolution_date'] and issue['resolution_date'].month == current_month and issue['resolution_date'].year == current_year:
-                    stats[assignee]['completed_this_month'] += 1
-            elif 'progress' in status_category:
-                stats[assignee]['in_progress'] += 1
-            else:
-                stats[assignee]['todo'] += 1
-            if issue['due_date'] and issue['due_date'] < today and status_category != 'done':
-                stats[assignee]['overdue_tasks'] += 1
-        for user_stat in stats.values():
-            if user_stat['total'] > 0:
-                user_stat['completion_rate'] = round((user_stat['completed'] / user_stat['total']) * 100, 1)
-            if user_stat['completed'] > 0:
-                user_stat['avg_time_per_task'] = round(user_stat['total_time_spent'] / user_stat['completed'])
-        return dict(stats)
-
-    def calculate_overall_stats(self, issues: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def calculate_user_stats(self, issues: List[Dict[str, Any]], today: date = None) -> Dict[str, Dict[str, Any]]:
+        if not issues:
+            return {}
+        df = pd.DataFrame(issues)
+        df = df[df['assignee'] != 'Unassigned']
+        if df.empty:
+            return {}
+
+        today = pd.Timestamp(today or date.today())
+        current_month = today.to_period('M')
+        is_done = df['is_done']
+        is_progress = ~is_done & df['status_category_lc'].str.contains('progress', regex=False)
+        resolution_month = pd.to_datetime(df['resolution_date']).dt.to_period('M')
+        df = df.assign(
+            is_progress=is_progress,
+            is_todo=~is_done & ~is_progress,
+            done_this_month=is_done & (resolution_month == current_month),
+            is_overdue=~is_done & (pd.to_datetime(df['due_date']) < today)
+        )
+
+        stats = df.groupby('assignee', sort=False).agg(
+            total=('key', 'count'),
+            completed=('is_done', 'sum'),
+            in_progress=('is_progress', 'sum'),
+            todo=('is_todo', 'sum'),
+            total_time_spent=('time_spent', 'sum'),
+            completed_this_month=('done_this_month', 'sum'),
+            overdue_tasks=('is_overdue', 'sum')
+        )
+        stats['assignee'] = stats.index
+        stats['completion_rate'] = (stats['completed'] / stats['total'] * 100).round(1)
+        stats['avg_time_per_task'] = (
+            stats['total_time_spent'] / stats['completed'].where(stats['completed'] > 0)
+        ).round().fillna(0).astype(int)
+
+        return stats[[
+            'assignee', 'total', 'completed', 'in_progress', 'todo',
+            'completion_rate', 'total_time_spent', 'avg_time_per_task',
+            'completed_this_month', 'overdue_tasks'
+        ]].to_dict(orient='index')
+
+    def calculate_overall_stats(self, issues: List[Dict[str, Any]], today: date = None) -> Dict[str, Any]:
         total = len(issues)
-        completed = sum(1 for i in issues if i['status_category'].lower() == 'done')
-        in_progress = sum(1 for i in issues if 'progress' in i['status_category'].lower())
+        completed = sum(1 for i in issues if i['is_done'])
+        in_progress = sum(1 for i in issues if 'progress' in i['status_category_lc'])
         todo = total - completed - in_progress
-        today = date.today()
-        overdue = sum(1 for i in issues if i['due_date'] and i['due_date'] < today and i['status_category'].lower() != 'done')
+        today = today or date.today()
+        overdue = sum(1 for i in issues if not i['is_done'] and i['due_date'] and i['due_date'] < today)
         return {
             'total': total, 'completed': completed, 'in_progress': in_progress,
             'todo': todo, 'overdue': overdue,
@@ -364,22 +605,30 @@ def analyze_jira():
         project_key = data.get('project_key', '')
 
         if not all([base_url, username, api_token]):
-            return jsonify({"error": "Missing required parameters."}), 400
-
-        analyzer = JiraProductivityAnalyzer(base_url, username, api_token)
-        result = analyzer.fetch_all_issues(project_key)
-        analysis = analyzer.analyze_productivity(result)
-        report = analyzer.calculate_overall_stats(analysis['issues'])
+            return ojsonify({"error": "Missing required parameters."}, 400)
+
+        cache_key = _jira_account_key(base_url, username, api_token)
+        with jira_analyzer_cache_lock:
+            analyzer = jira_analyzer_cache.get(cache_key)
+            if analyzer is None:
+                analyzer = jira_analyzer_cache[cache_key] = JiraProductivityAnalyzer(base_url, username, api_token)
+            analyzer.acquire()
+        try:
+            result = analyzer.fetch_all_issues(project_key)
+            analysis = analyzer.analyze_productivity(result)
+        finally:
+            analyzer.release()
 
-        return jsonify({
-            "summary": report,
+        return ojsonify({
+            "summary": analysis['overall_stats'],
             "user_stats": analysis['user_stats']
         })
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 # ------------------ Flask App Entry ------------------
 
+# Production runs under gunicorn (see Procfile); this is the local dev server only
 if __name__ == '__main__':
-    app.run(debug=True, port=5002)
+    app.run(debug=bool(os.environ.get('FLASK_DEV')), port=5002)
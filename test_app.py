@@ -0,0 +1,12 @@
+from datetime import date
+
+from app import _parse_dates
+
+
+def test_parse_dates_keeps_local_date_and_maps_missing_to_none():
+    values = ["2024-03-05T23:30:00.000+0530", None, "", "2024-12-31", "not a date"]
+    assert _parse_dates(values) == [date(2024, 3, 5), None, None, date(2024, 12, 31), None]
+
+
+def test_parse_dates_all_missing():
+    assert _parse_dates([None, None]) == [None, None]